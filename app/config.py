@@ -2,9 +2,12 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 
-COHERE_API_KEY = os.getenv(Yourapikeyhere)
+COHERE_API_KEY = os.getenv("COHERE_API_KEY")
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 100
 VECTORSTORE_DIR = "vectorstore"
 DATA_DIR = "path_to_data_folder"
 DATA_DIR = os.getenv("DATA_DIR", "data")
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
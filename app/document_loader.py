@@ -4,6 +4,7 @@ from docx import Document
 from langchain.docstore.document import Document as LC_Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from config import DATA_DIR, CHUNK_SIZE, CHUNK_OVERLAP
+from app.metrics import timed
 from PIL import Image
 import fitz  # PyMuPDF
 import io
@@ -54,8 +55,10 @@ def split_documents(documents):
 
 
 def load_and_split_documents():
-    raw_docs = load_all_documents()
-    return split_documents(raw_docs)
+    with timed("load_documents"):
+        raw_docs = load_all_documents()
+    with timed("split_documents"):
+        return split_documents(raw_docs)
 
 def extract_images_from_pdf(path):
     doc = fitz.open(path)
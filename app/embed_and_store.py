@@ -1,27 +1,46 @@
 from langchain_cohere import CohereEmbeddings
 from langchain_community.vectorstores import FAISS
 from config import COHERE_API_KEY, VECTORSTORE_DIR
+from app.metrics import timed
 import os
-from transformers import CLIPProcessor, CLIPModel
-import torch
 from langchain_community.vectorstores import FAISS
 
-clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
-clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+# CLIP is loaded on first use so importing this module does not download the model
+clip_model = None
+clip_processor = None
+
+def _load_clip():
+    global clip_model, clip_processor
+    if clip_model is None:
+        from transformers import CLIPProcessor, CLIPModel
+        clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
+        clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
 
 def embed_image(pil_image):
+    import torch
+
+    _load_clip()
     inputs = clip_processor(images=pil_image, return_tensors="pt")
     with torch.no_grad():
         embeddings = clip_model.get_image_features(**inputs)
     return embeddings.squeeze().numpy()
-def create_vectorstore(documents):
-    embeddings = CohereEmbeddings(
-    cohere_api_key=COHERE_API_KEY,
-    model="embed-english-v3.0"  # or "embed-multilingual-v3.0" if needed
-)
+def create_vectorstore(documents, embeddings=None, persist_dir=VECTORSTORE_DIR):
+    if embeddings is None:
+        embeddings = CohereEmbeddings(
+            cohere_api_key=COHERE_API_KEY,
+            model="embed-english-v3.0"  # or "embed-multilingual-v3.0" if needed
+        )
+
+    texts = [doc.page_content for doc in documents]
+    metadatas = [doc.metadata for doc in documents]
 
-    vectorstore = FAISS.from_documents(documents, embeddings)
-    vectorstore.save_local(VECTORSTORE_DIR)
+    # Embed and build separately so each stage shows up in the metrics
+    with timed("embed_documents"):
+        vectors = embeddings.embed_documents(texts)
+    with timed("index_build"):
+        vectorstore = FAISS.from_embeddings(list(zip(texts, vectors)), embeddings, metadatas=metadatas)
+    with timed("index_save"):
+        vectorstore.save_local(persist_dir)
     
     return vectorstore
 
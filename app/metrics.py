@@ -0,0 +1,207 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+# Bucket upper bounds in seconds, shared by every stage histogram
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_histograms = {}
+_tokens = Counter()
+_queue_depth = 0
+
+# Stage timings of the request currently being served, used for Server-Timing
+_request_timings = ContextVar("request_timings", default=None)
+# Profiler attached to the request currently being served, if any
+_active_profiler = ContextVar("active_profiler", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+def observe_stage(stage, seconds):
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = Histogram()
+        hist.observe(seconds)
+
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+@contextmanager
+def timed(stage):
+    """Time the enclosed block and record it under the given stage name"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def record_tokens(kind, count):
+    if not count:
+        return
+    with _lock:
+        _tokens[kind] += count
+
+
+def inc_queue_depth(amount=1):
+    global _queue_depth
+    with _lock:
+        _queue_depth += amount
+
+
+def dec_queue_depth(amount=1):
+    inc_queue_depth(-amount)
+
+
+def start_request_timings():
+    """Begin collecting stage timings for the current request context"""
+    return _request_timings.set([])
+
+
+def finish_request_timings(token):
+    timings = _request_timings.get() or []
+    _request_timings.reset(token)
+    return timings
+
+
+def format_server_timing(timings):
+    """Render collected stage timings as a Server-Timing header value"""
+    totals = {}
+    for stage, seconds in timings:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in totals.items())
+
+
+def _format_bound(bound):
+    return repr(float(bound))
+
+
+def render_prometheus():
+    """Render all collected metrics in the Prometheus text exposition format"""
+    lines = []
+    with _lock:
+        lines.append("# HELP rag_stage_duration_seconds Time spent in each pipeline stage.")
+        lines.append("# TYPE rag_stage_duration_seconds histogram")
+        for stage in sorted(_histograms):
+            hist = _histograms[stage]
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                lines.append(
+                    f'rag_stage_duration_seconds_bucket{{stage="{stage}",le="{_format_bound(bound)}"}} {cumulative}'
+                )
+            lines.append(f'rag_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {hist.count}')
+            lines.append(f'rag_stage_duration_seconds_sum{{stage="{stage}"}} {hist.sum}')
+            lines.append(f'rag_stage_duration_seconds_count{{stage="{stage}"}} {hist.count}')
+
+        lines.append("# HELP rag_tokens_total Tokens consumed by the language model.")
+        lines.append("# TYPE rag_tokens_total counter")
+        for kind in sorted(_tokens):
+            lines.append(f'rag_tokens_total{{kind="{kind}"}} {_tokens[kind]}')
+
+        lines.append("# HELP rag_queue_depth Chat requests in flight, including those waiting for a worker thread.")
+        lines.append("# TYPE rag_queue_depth gauge")
+        lines.append(f"rag_queue_depth {_queue_depth}")
+
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Clear all collected metrics"""
+    global _queue_depth
+    with _lock:
+        _histograms.clear()
+        _tokens.clear()
+        _queue_depth = 0
+
+
+class SamplingProfiler:
+    """Periodically samples the stacks of a set of threads and counts collapsed stacks"""
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_ids = {thread_id or threading.get_ident()}
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def __enter__(self):
+        self._token = _active_profiler.set(self.start())
+        return self
+
+    def __exit__(self, *exc):
+        _active_profiler.reset(self._token)
+        self.stop()
+
+    def save(self, folder="profiles"):
+        """Write samples in collapsed-stack format, readable by flamegraph tools"""
+        os.makedirs(folder, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        filepath = os.path.join(folder, f"profile_{timestamp}.folded")
+        with open(filepath, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return filepath
+
+
+@contextmanager
+def profile_current_thread():
+    """Add the calling thread to the current request's profiler while the block runs"""
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    profiler.thread_ids.add(thread_id)
+    try:
+        yield
+    finally:
+        profiler.thread_ids.discard(thread_id)
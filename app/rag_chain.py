@@ -1,29 +1,45 @@
-
 from langchain_cohere import ChatCohere
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 from embed_and_store import load_vectorstore
+from app.metrics import timed, record_tokens
+
+TOP_K = 3
 
 def format_docs(docs):
     return "\n\n".join([doc.page_content for doc in docs])
 
-def get_qa_chain():
+def get_qa_chain(vectorstore=None, llm=None):
     try:
-        vectorstore = load_vectorstore()
-        retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
+        if vectorstore is None:
+            vectorstore = load_vectorstore()
+        retriever = vectorstore.as_retriever(search_kwargs={"k": TOP_K})
 
         # Use proper ChatPromptTemplate for ChatCohere
         prompt = ChatPromptTemplate.from_messages([
             ("system", "You are a helpful assistant. Use the context to answer the question. If the answer is not in the context, say 'I don't know'."),
             ("human", "Context:\n{context}\n\nQuestion:\n{question}")
         ])
+        if llm is None:
+            llm = ChatCohere(model="command-r-plus", temperature=0.3)
+
+        # Run each stage explicitly so embedding, search, prompt and generation are timed separately
+        def answer(question):
+            with timed("embed_query"):
+                query_vector = vectorstore.embeddings.embed_query(question)
+            with timed("faiss_search"):
+                docs = vectorstore.similarity_search_by_vector(query_vector, k=TOP_K)
+            with timed("prompt_build"):
+                messages = prompt.invoke({"context": format_docs(docs), "question": question})
+            with timed("generation"):
+                result = llm.invoke(messages)
+
+            usage = getattr(result, "usage_metadata", None) or {}
+            record_tokens("input", usage.get("input_tokens"))
+            record_tokens("output", usage.get("output_tokens"))
+            return result
 
-        # Use Lambda to format retriever output
-        rag_chain = (
-            RunnableLambda(lambda q: {"context": format_docs(retriever.invoke(q)), "question": q})
-            | prompt
-            | ChatCohere(model="command-r-plus", temperature=0.3)
-        )
+        rag_chain = RunnableLambda(answer)
 
         return rag_chain, retriever
 
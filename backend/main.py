@@ -1,12 +1,14 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, status
+from fastapi import FastAPI, Request, UploadFile, File, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, FileResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import os
 import shutil
 import uuid
+import time
 from datetime import datetime
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,7 +17,8 @@ from app.document_loader import load_and_split_documents
 from app.embed_and_store import create_vectorstore, load_vectorstore
 from app.rag_chain import get_qa_chain
 from app.memory import ChatMemory
-from app.config import DATA_DIR
+from app.config import DATA_DIR, PROFILING_ENABLED, PROFILE_DIR
+from app import metrics
 
 app = FastAPI(title="DocuMind AI", description="Professional Document Intelligence Platform", version="1.0.0")
 
@@ -28,11 +31,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    """Collect per-request stage timings and optionally profile the request"""
+    token = metrics.start_request_timings()
+    profiler = None
+    if PROFILING_ENABLED and request.headers.get("X-Profile") == "1":
+        profiler = metrics.SamplingProfiler()
+    queued = request.url.path == "/api/chat"
+    if queued:
+        metrics.inc_queue_depth()
+
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            with profiler:
+                response = await call_next(request)
+        else:
+            response = await call_next(request)
+    finally:
+        total = time.perf_counter() - start
+        timings = metrics.finish_request_timings(token)
+        if queued:
+            metrics.dec_queue_depth()
+        if profiler is not None:
+            profile_path = profiler.save(PROFILE_DIR)
+
+    if request.headers.get("X-Timing") == "1":
+        timings.append(("total", total))
+        response.headers["Server-Timing"] = metrics.format_server_timing(timings)
+    if profiler is not None:
+        response.headers["X-Profile"] = profile_path
+    return response
+
 # Global variables for session management
 qa_chain = None
 retriever = None
 chat_memory = ChatMemory()
 
+def answer_question(question):
+    """Run the blocking RAG chain and source lookup; called from a worker thread"""
+    with metrics.profile_current_thread():
+        result = qa_chain.invoke(question)
+        with metrics.timed("retrieve_sources"):
+            docs = retriever.invoke(question)
+    return result, docs
+
 class ChatMessage(BaseModel):
     message: str
     session_id: Optional[str] = None
@@ -71,6 +115,11 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Expose collected metrics in Prometheus text format"""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.post("/api/upload", response_model=UploadResponse)
 async def upload_documents(files: List[UploadFile] = File(...)):
     """Upload and store documents"""
@@ -123,11 +172,8 @@ async def chat(message: ChatMessage):
         raise HTTPException(status_code=503, detail="RAG system not initialized. Please upload and index documents first.")
     
     try:
-        # Generate response using RAG chain
-        result = qa_chain.invoke(message.message)
-        
-        # Get relevant documents
-        docs = retriever.invoke(message.message)
+        # Generate response and fetch relevant documents off the event loop
+        result, docs = await run_in_threadpool(answer_question, message.message)
         sources = []
         
         for i, doc in enumerate(docs):
@@ -0,0 +1,47 @@
+import tempfile
+from collections import defaultdict
+
+from benchmarks.common import measure, metric, summarize
+from benchmarks.corpus import generate_chunk_documents
+from benchmarks.stubs import StubEmbeddings
+from app import metrics
+from app.embed_and_store import create_vectorstore
+
+
+def bench_embedding(size, args):
+    """create_vectorstore throughput with the local stub, split into the stages app.metrics records"""
+    documents = generate_chunk_documents(size)
+    embeddings = StubEmbeddings(dim=args.dim, latency=args.embed_latency_ms / 1000)
+    stages = defaultdict(list)
+
+    with tempfile.TemporaryDirectory() as persist_dir:
+        def build():
+            # Collect the embed_documents / index_build / index_save timings of this call
+            token = metrics.start_request_timings()
+            create_vectorstore(documents, embeddings=embeddings, persist_dir=persist_dir)
+            for stage, seconds in metrics.finish_request_timings(token):
+                stages[stage].append(seconds)
+
+        build()
+        stages.clear()
+        store_seconds, store_spread = summarize(measure(build, args.repeats, args.min_sample_ms / 1000, warmup=0))
+
+    results = {
+        f"embedding.{size}.create_vectorstore_seconds": metric(store_seconds, "s", "lower", store_spread),
+        f"embedding.{size}.create_vectorstore_chunks_per_s": metric(size / store_seconds, "chunks/s", "higher", store_spread),
+    }
+    for stage, samples in stages.items():
+        seconds, spread = summarize(samples)
+        results[f"embedding.{size}.{stage}_seconds"] = metric(seconds, "s", "lower", spread)
+    return results
+
+
+def run(args):
+    results = {}
+    for size in args.sizes:
+        # Vectors are Python lists of floats here (~32 bytes each), and create_vectorstore copies them again
+        if size > args.max_embedding_size:
+            print(f"Skipping embedding at {size} chunks: above --max-embedding-size {args.max_embedding_size}")
+            continue
+        results.update(bench_embedding(size, args))
+    return results
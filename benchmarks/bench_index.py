@@ -0,0 +1,100 @@
+import math
+
+import faiss
+
+from benchmarks.common import measure, metric, summarize
+from benchmarks.corpus import generate_vectors, generate_queries
+
+INDEX_TYPES = ("flat", "ivf", "hnsw", "ivfpq")
+
+# FAISS k-means warns below 39 training points per centroid and trains poorly
+MIN_POINTS_PER_CENTROID = 39
+# Product quantizer code size; each sub-quantizer codebook has 2**PQ_BITS centroids
+PQ_BITS = 8
+PQ_CENTROIDS = 2 ** PQ_BITS
+
+
+def _nlist(n):
+    """IVF list count: the usual 4*sqrt(n), capped so every list is trained properly"""
+    return max(1, min(int(4 * math.sqrt(n)), n // MIN_POINTS_PER_CENTROID))
+
+
+def min_training_points(index_type):
+    if index_type == "ivf":
+        return MIN_POINTS_PER_CENTROID
+    if index_type == "ivfpq":
+        return PQ_CENTROIDS * MIN_POINTS_PER_CENTROID
+    return 0
+
+
+def build_index(index_type, vectors):
+    """Train (if needed) and fill a FAISS index of the given type"""
+    n, dim = vectors.shape
+    nlist = _nlist(n)
+
+    if index_type == "flat":
+        # What langchain's FAISS wrapper, and so this app, uses
+        index = faiss.IndexFlatL2(dim)
+    elif index_type == "ivf":
+        index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, nlist)
+        index.nprobe = min(nlist, 16)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, 32)
+        index.hnsw.efSearch = 64
+    elif index_type == "ivfpq":
+        m = next(m for m in (64, 32, 16, 8, 4, 2, 1) if dim % m == 0)
+        index = faiss.IndexIVFPQ(faiss.IndexFlatL2(dim), dim, nlist, m, PQ_BITS)
+        index.nprobe = min(nlist, 16)
+    else:
+        raise ValueError(f"Unknown index type: {index_type}")
+
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    return index
+
+
+def recall_at_k(found, expected, k):
+    hits = sum(len(set(f[:k]) & set(e[:k])) for f, e in zip(found, expected))
+    return hits / (len(expected) * k)
+
+
+def bench_index(index_type, vectors, queries, ground_truth, args):
+    size = len(vectors)
+    prefix = f"index.{index_type}.{size}"
+    min_seconds = args.min_sample_ms / 1000
+
+    build_seconds, build_spread = summarize(measure(lambda: build_index(index_type, vectors), args.repeats, min_seconds))
+    index = build_index(index_type, vectors)
+
+    # One query per call, the way the retriever issues them
+    def search_all():
+        return [index.search(query.reshape(1, -1), args.k)[1][0] for query in queries]
+
+    search_seconds, search_spread = summarize(measure(search_all, args.repeats, min_seconds))
+
+    return {
+        f"{prefix}.build_seconds": metric(build_seconds, "s", "lower", build_spread),
+        f"{prefix}.index_bytes": metric(int(faiss.serialize_index(index).nbytes), "bytes", "lower"),
+        f"{prefix}.search_qps": metric(len(queries) / search_seconds, "queries/s", "higher", search_spread),
+        f"{prefix}.recall_at_{args.k}": metric(recall_at_k(search_all(), ground_truth, args.k), "ratio", "higher"),
+    }
+
+
+def run(args):
+    results = {}
+    for size in args.sizes:
+        vectors = generate_vectors(size, args.dim)
+        queries = generate_queries(vectors, args.queries)
+        exact = faiss.IndexFlatL2(args.dim)
+        exact.add(vectors)
+        _, ground_truth = exact.search(queries, args.k)
+        del exact
+
+        for index_type in args.index_types:
+            needed = min_training_points(index_type)
+            if size < needed:
+                print(f"Skipping {index_type} at {size} vectors: needs at least {needed} to train")
+                continue
+            results.update(bench_index(index_type, vectors, queries, ground_truth, args))
+    return results
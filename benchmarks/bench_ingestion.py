@@ -0,0 +1,50 @@
+import os
+
+from benchmarks.common import measure, metric, summarize
+from benchmarks.corpus import generate_documents, pdf_paths
+from langchain.docstore.document import Document as LC_Document
+from app.document_loader import load_pdf_file, split_documents
+
+
+def bench_parse(args):
+    """Text extraction throughput over the PDFs shipped in data/"""
+    results = {}
+    paths = pdf_paths()
+    if not paths:
+        return results
+
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    texts = [load_pdf_file(path) for path in paths]
+    total_chars = sum(len(text) for text in texts)
+
+    seconds, spread = summarize(measure(lambda: [load_pdf_file(path) for path in paths], args.repeats, args.min_sample_ms / 1000))
+    results["ingestion.parse.pdf.seconds"] = metric(seconds, "s", "lower", spread)
+    results["ingestion.parse.pdf.mb_per_s"] = metric(total_bytes / 1e6 / seconds, "MB/s", "higher", spread)
+    results["ingestion.parse.pdf.chars_per_s"] = metric(total_chars / seconds, "chars/s", "higher", spread)
+
+    documents = [LC_Document(page_content=text, metadata={"source": os.path.basename(path)}) for path, text in zip(paths, texts)]
+    n_chunks = len(split_documents(documents))
+    seconds, spread = summarize(measure(lambda: split_documents(documents), args.repeats, args.min_sample_ms / 1000))
+    results["ingestion.split.pdf.chunks_per_s"] = metric(n_chunks / seconds, "chunks/s", "higher", spread)
+    return results
+
+
+def bench_split(size, args):
+    """Splitter throughput over a synthetic corpus that yields about `size` chunks"""
+    documents = generate_documents(size)
+    total_chars = sum(len(doc.page_content) for doc in documents)
+    n_chunks = len(split_documents(documents))
+
+    seconds, spread = summarize(measure(lambda: split_documents(documents), args.repeats, args.min_sample_ms / 1000))
+    return {
+        f"ingestion.split.{size}.seconds": metric(seconds, "s", "lower", spread),
+        f"ingestion.split.{size}.chunks_per_s": metric(n_chunks / seconds, "chunks/s", "higher", spread),
+        f"ingestion.split.{size}.mb_per_s": metric(total_chars / 1e6 / seconds, "MB/s", "higher", spread),
+    }
+
+
+def run(args):
+    results = bench_parse(args)
+    for size in args.sizes:
+        results.update(bench_split(size, args))
+    return results
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from benchmarks.common import ROOT_DIR, metric, percentiles
+from benchmarks.corpus import generate_chunk_documents
+from benchmarks.stubs import StubEmbeddings, StubChatModel
+from app.embed_and_store import create_vectorstore
+from app.rag_chain import get_qa_chain
+
+QUESTIONS = [
+    "What is the main topic of the document?",
+    "Summarise the experimental procedure.",
+    "Which results are reported in the conclusion?",
+    "How is the network configured?",
+]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app):
+    """Run the app with uvicorn in a background thread and wait until it accepts connections"""
+    # Lifespan off so the startup hook does not replace the stubbed chain with a Cohere one
+    config = uvicorn.Config(app, host="127.0.0.1", port=_free_port(), lifespan="off", log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{config.port}"
+
+
+async def _load(base_url, n_requests, concurrency):
+    latencies = []
+    errors = 0
+    counter = iter(range(n_requests))
+
+    async def worker(client):
+        nonlocal errors
+        for i in counter:
+            payload = {"message": QUESTIONS[i % len(QUESTIONS)]}
+            start = time.perf_counter()
+            try:
+                response = await client.post("/api/chat", json=payload)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def run(args):
+    # backend.main mounts ./static relative to the working directory
+    os.chdir(ROOT_DIR)
+    from backend import main as backend_main
+
+    embeddings = StubEmbeddings(dim=args.dim, latency=args.embed_latency_ms / 1000)
+    with tempfile.TemporaryDirectory() as persist_dir:
+        vectorstore = create_vectorstore(generate_chunk_documents(args.serving_chunks), embeddings=embeddings, persist_dir=persist_dir)
+    backend_main.qa_chain, backend_main.retriever = get_qa_chain(
+        vectorstore=vectorstore, llm=StubChatModel(latency=args.llm_latency_ms / 1000)
+    )
+
+    server, thread, base_url = start_server(backend_main.app)
+    try:
+        asyncio.run(_load(base_url, args.warmup, args.concurrency))
+        latencies, errors, elapsed = asyncio.run(_load(base_url, args.requests, args.concurrency))
+    finally:
+        server.should_exit = True
+        thread.join()
+        backend_main.chat_memory.clear()
+
+    cuts = percentiles(latencies)
+    return {
+        "serving.chat.p50_ms": metric(cuts["p50"] * 1000, "ms", "lower"),
+        "serving.chat.p95_ms": metric(cuts["p95"] * 1000, "ms", "lower"),
+        "serving.chat.p99_ms": metric(cuts["p99"] * 1000, "ms", "lower"),
+        "serving.chat.requests_per_s": metric(len(latencies) / elapsed, "req/s", "higher"),
+        "serving.chat.errors": metric(errors, "count", "lower"),
+    }
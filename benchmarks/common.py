@@ -0,0 +1,60 @@
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT_DIR, "app")
+# app/ modules import their siblings without the package prefix (`from config import ...`)
+sys.path.append(ROOT_DIR)
+sys.path.append(APP_DIR)
+
+PDF_DIR = os.path.join(ROOT_DIR, "data")
+
+
+def metric(value, unit, better, spread=None):
+    """A single benchmark result; `better` is "higher" or "lower", `spread` is (max - min) / median of its samples"""
+    result = {"value": value, "unit": unit, "better": better}
+    if spread is not None:
+        result["spread"] = spread
+    return result
+
+
+def measure(fn, repeats=5, min_seconds=0.05, warmup=1):
+    """Per-call seconds of `fn` for each of `repeats` samples, taken after `warmup` untimed calls
+
+    Each sample calls `fn` until at least `min_seconds` have passed, so fast
+    operations are never timed at the resolution of a single call.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeats):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                break
+        samples.append(elapsed / calls)
+    return samples
+
+
+def summarize(samples):
+    """Median of the samples and their relative spread"""
+    median = statistics.median(samples)
+    spread = (max(samples) - min(samples)) / median if median else 0.0
+    return median, spread
+
+
+def percentiles(samples):
+    """Return p50/p95/p99 of a list of latencies"""
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
@@ -0,0 +1,78 @@
+import os
+import random
+
+import numpy as np
+from langchain.docstore.document import Document as LC_Document
+
+from benchmarks.common import PDF_DIR
+from app.config import CHUNK_SIZE
+
+VOCAB_SIZE = 5000
+
+
+def _vocabulary(rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(2, 10))) for _ in range(VOCAB_SIZE)]
+
+
+def generate_chunks(n_chunks, chunk_size=CHUNK_SIZE, seed=0):
+    """Yield `n_chunks` deterministic pseudo-text strings of roughly `chunk_size` characters"""
+    rng = random.Random(seed)
+    vocab = _vocabulary(rng)
+    for _ in range(n_chunks):
+        parts = []
+        length = 0
+        while length < chunk_size:
+            # Sentences and paragraphs give the splitter real separators to work with
+            sentence = " ".join(rng.choice(vocab) for _ in range(rng.randint(6, 18))).capitalize() + "."
+            parts.append(sentence)
+            parts.append("\n\n" if rng.random() < 0.2 else " ")
+            length += len(sentence) + 1
+        yield "".join(parts).strip()[:chunk_size]
+
+
+def generate_documents(n_chunks, chunks_per_document=50, chunk_size=CHUNK_SIZE, seed=0):
+    """Build raw documents whose total length splits into about `n_chunks` chunks"""
+    documents = []
+    buffer = []
+    for i, chunk in enumerate(generate_chunks(n_chunks, chunk_size, seed)):
+        buffer.append(chunk)
+        if len(buffer) == chunks_per_document:
+            documents.append(LC_Document(page_content="\n\n".join(buffer), metadata={"source": f"synthetic_{i // chunks_per_document}.txt"}))
+            buffer = []
+    if buffer:
+        documents.append(LC_Document(page_content="\n\n".join(buffer), metadata={"source": f"synthetic_{n_chunks // chunks_per_document}.txt"}))
+    return documents
+
+
+def generate_chunk_documents(n_chunks, chunk_size=CHUNK_SIZE, seed=0):
+    """Already-split chunk documents, as `create_vectorstore` receives them"""
+    return [
+        LC_Document(page_content=text, metadata={"source": f"synthetic_{i}.txt"})
+        for i, text in enumerate(generate_chunks(n_chunks, chunk_size, seed))
+    ]
+
+
+def generate_vectors(n_vectors, dim, n_clusters=100, seed=0):
+    """Clustered unit vectors, so approximate indexes have structure to exploit"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype("float32")
+    labels = rng.integers(0, n_clusters, n_vectors)
+    vectors = centers[labels] + 0.5 * rng.standard_normal((n_vectors, dim)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def generate_queries(vectors, n_queries, seed=1):
+    """Noisy copies of random corpus vectors"""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(vectors), n_queries)
+    queries = vectors[picks] + 0.1 * rng.standard_normal((n_queries, vectors.shape[1])).astype("float32")
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return queries
+
+
+def pdf_paths():
+    if not os.path.isdir(PDF_DIR):
+        return []
+    return sorted(os.path.join(PDF_DIR, name) for name in os.listdir(PDF_DIR) if name.lower().endswith(".pdf"))
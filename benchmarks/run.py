@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Run the DocuMind AI benchmark suite and compare the results against a saved baseline
+
+    python -m benchmarks.run --suites ingestion,index --sizes 1000,10000
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import traceback
+from datetime import datetime
+
+from benchmarks.common import ROOT_DIR
+
+SUITES = ("ingestion", "embedding", "index", "serving")
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+
+# Settings that change what the metrics measure; runs are only comparable when these match
+COMPARED_ARGS = (
+    "sizes", "dim", "k", "queries", "index_types", "embed_latency_ms", "llm_latency_ms",
+    "max_embedding_size", "serving_chunks", "requests", "warmup", "concurrency",
+)
+
+
+def _csv(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _sizes(value):
+    return [int(float(item)) for item in _csv(value)]
+
+
+def parse_args(argv=None):
+    from benchmarks.bench_index import INDEX_TYPES
+
+    parser = argparse.ArgumentParser(description="DocuMind AI benchmarks")
+    parser.add_argument("--suites", type=_csv, default=list(SUITES), help="comma-separated subset of: " + ", ".join(SUITES))
+    parser.add_argument("--sizes", type=_sizes, default=[1000, 10000], help="corpus sizes in chunks, e.g. 1000,10000,1e6")
+    parser.add_argument("--dim", type=int, default=1024, help="embedding dimension of the stub and synthetic vectors")
+    parser.add_argument("--k", type=int, default=10, help="neighbours per query for recall@k")
+    parser.add_argument("--queries", type=int, default=1000, help="queries per index for QPS and recall")
+    parser.add_argument("--index-types", type=_csv, default=list(INDEX_TYPES))
+    parser.add_argument("--repeats", type=int, default=5, help="timed samples per measurement; the median is reported")
+    parser.add_argument("--min-sample-ms", type=float, default=50.0, help="each sample repeats the operation until it lasts this long")
+    parser.add_argument("--max-embedding-size", type=int, default=20000, help="largest size the embedding suite runs; larger sizes are skipped")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="simulated latency per stub embedding call")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="simulated latency per stub LLM call")
+    parser.add_argument("--serving-chunks", type=int, default=1000, help="index size behind /api/chat in the load test")
+    parser.add_argument("--requests", type=int, default=200, help="/api/chat requests in the load test")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed requests before the load test")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", default=None, help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+    return args
+
+
+def run_suites(args):
+    """Run each selected suite; a crashing suite is reported and the rest still run"""
+    import importlib
+
+    metrics = {}
+    failed = []
+    for suite in args.suites:
+        print(f"Running {suite} benchmarks...")
+        try:
+            module = importlib.import_module(f"benchmarks.bench_{suite}")
+            metrics.update(module.run(args))
+        except Exception:
+            traceback.print_exc()
+            failed.append(suite)
+    return metrics, failed
+
+
+def mismatched_args(current, baseline):
+    """Return (name, baseline, current) for every compared setting that differs"""
+    return [
+        (name, baseline[name], current[name])
+        for name in COMPARED_ARGS
+        if name in baseline and name in current and baseline[name] != current[name]
+    ]
+
+
+def missing_metrics(current, baseline, suites):
+    """Baseline metrics of the suites that ran which this run did not produce"""
+    return sorted(name for name in baseline if name.split(".")[0] in suites and name not in current)
+
+
+def compare(current, baseline, threshold):
+    """Return (name, baseline, current, change) for every metric that regressed by more than `threshold`
+
+    A change must also exceed the combined sample spread of both runs, so
+    differences within measured noise are not reported.
+    """
+    regressions = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["value"], result["value"]
+        # A relative change against zero is meaningless, so zero baselines are never scored
+        if not old:
+            continue
+        if result["better"] == "higher":
+            change = (old - new) / old
+        else:
+            change = (new - old) / old
+        noise = baseline[name].get("spread", 0.0) + result.get("spread", 0.0)
+        if change > max(threshold, noise):
+            regressions.append((name, old, new, change))
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    metrics, failed_suites = run_suites(args)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "save_baseline")},
+        },
+        "metrics": metrics,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    for name in sorted(metrics):
+        print(f"  {name:<55} {metrics[name]['value']:>14.4f} {metrics[name]['unit']}")
+
+    if failed_suites:
+        print(f"FAILED: suites crashed: {', '.join(failed_suites)}")
+        return 1
+
+    # Failed requests are a failure on their own; they usually have a zero baseline
+    failed = metrics.get("serving.chat.errors", {}).get("value", 0)
+    if failed:
+        print(f"FAILED: {failed} /api/chat requests returned errors")
+        return 1
+
+    if args.save_baseline:
+        shutil.copyfile(output, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found, skipping comparison (use --save-baseline to create one)")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    mismatches = mismatched_args(report["meta"]["args"], baseline["meta"]["args"])
+    if mismatches:
+        print(f"Not comparing: settings differ from {args.baseline}:")
+        for name, old, new in mismatches:
+            print(f"  --{name.replace('_', '-')}: baseline {old}, this run {new}")
+        print("Re-run with the baseline's settings, or save a new baseline with --save-baseline")
+        return 2
+
+    status = 0
+    missing = missing_metrics(metrics, baseline["metrics"], args.suites)
+    if missing:
+        print(f"MISSING: {len(missing)} baseline metrics were not produced by this run:")
+        for name in missing:
+            print(f"  {name}")
+        status = 1
+
+    regressions = compare(metrics, baseline["metrics"], args.threshold)
+    if regressions:
+        print(f"REGRESSIONS beyond {args.threshold:.0%} against {args.baseline}:")
+        for name, old, new, change in regressions:
+            print(f"  {name}: {old:.4f} -> {new:.4f} ({change:+.1%} worse)")
+        status = 1
+    elif not missing:
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import time
+import zlib
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+# Dimension of Cohere's embed-english-v3.0, which the app uses in production
+EMBEDDING_DIM = 1024
+
+
+class StubEmbeddings(Embeddings):
+    """Deterministic local embeddings with an optional simulated per-call latency"""
+
+    def __init__(self, dim=EMBEDDING_DIM, latency=0.0, batch_size=96):
+        self.dim = dim
+        self.latency = latency
+        # Cohere accepts at most 96 texts per embed call
+        self.batch_size = batch_size
+
+    def _vector(self, text):
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        vector = rng.standard_normal(self.dim).astype("float32")
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            if self.latency:
+                time.sleep(self.latency)
+            vectors.extend(self._vector(text) for text in texts[start:start + self.batch_size])
+        return vectors
+
+    def embed_query(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._vector(text)
+
+
+class StubChatModel(FakeListChatModel):
+    """Chat model returning a canned answer after `latency` seconds"""
+
+    responses: list = ["This is a stubbed answer used for benchmarking."]
+    latency: float = 0.0
+
+    def _call(self, *args, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return super()._call(*args, **kwargs)
@@ -0,0 +1,97 @@
+import asyncio
+import importlib
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.common import ROOT_DIR
+from benchmarks.corpus import generate_chunk_documents
+from benchmarks.stubs import StubEmbeddings, StubChatModel
+from app import metrics
+from app.embed_and_store import create_vectorstore
+from app.rag_chain import get_qa_chain
+
+
+@pytest.fixture(scope="module")
+def backend():
+    # backend.main mounts ./static relative to the working directory
+    cwd = os.getcwd()
+    os.chdir(ROOT_DIR)
+    try:
+        return importlib.import_module("backend.main")
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture(scope="module")
+def stub_chain():
+    with tempfile.TemporaryDirectory() as persist_dir:
+        vectorstore = create_vectorstore(generate_chunk_documents(20), embeddings=StubEmbeddings(dim=32), persist_dir=persist_dir)
+    return get_qa_chain(vectorstore=vectorstore, llm=StubChatModel())
+
+
+@pytest.fixture
+def client(backend, stub_chain, monkeypatch):
+    qa_chain, retriever = stub_chain
+    monkeypatch.setattr(backend, "qa_chain", qa_chain)
+    monkeypatch.setattr(backend, "retriever", retriever)
+    metrics.reset()
+    yield TestClient(backend.app)
+    backend.chat_memory.clear()
+    metrics.reset()
+
+
+def _metric_lines(client, prefix):
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    return [line for line in response.text.splitlines() if line.startswith(prefix)]
+
+
+def test_metrics_endpoint_exports_chat_stages(client):
+    assert client.post("/api/chat", json={"message": "What is this about?"}).status_code == 200
+
+    response = client.get("/api/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    for stage in ("embed_query", "faiss_search", "prompt_build", "generation", "retrieve_sources"):
+        assert f'rag_stage_duration_seconds_count{{stage="{stage}"}} 1' in response.text
+    assert _metric_lines(client, "rag_queue_depth ") == ["rag_queue_depth 0"]
+
+
+def test_server_timing_only_on_request(client):
+    response = client.post("/api/chat", json={"message": "question"}, headers={"X-Timing": "1"})
+    stages = [part.split(";")[0] for part in response.headers["Server-Timing"].split(", ")]
+    assert stages == ["embed_query", "faiss_search", "prompt_build", "generation", "retrieve_sources", "total"]
+
+    response = client.post("/api/chat", json={"message": "question"})
+    assert "Server-Timing" not in response.headers
+
+
+def test_queue_depth_returns_to_zero_after_failed_chat(client, backend, monkeypatch):
+    class FailingChain:
+        def invoke(self, question):
+            raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(backend, "qa_chain", FailingChain())
+
+    assert client.post("/api/chat", json={"message": "question"}).status_code == 500
+    assert _metric_lines(client, "rag_queue_depth ") == ["rag_queue_depth 0"]
+
+
+def test_chain_runs_off_the_event_loop(client, backend, monkeypatch):
+    qa_chain = backend.qa_chain
+    loops = []
+
+    class RecordingChain:
+        def invoke(self, question):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return qa_chain.invoke(question)
+
+    monkeypatch.setattr(backend, "qa_chain", RecordingChain())
+
+    assert client.post("/api/chat", json={"message": "question"}).status_code == 200
+    assert loops == [None]
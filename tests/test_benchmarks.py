@@ -0,0 +1,121 @@
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks import run
+from benchmarks.common import measure, metric, percentiles, summarize
+from benchmarks.bench_index import MIN_POINTS_PER_CENTROID, PQ_CENTROIDS, _nlist, min_training_points, recall_at_k
+
+
+def test_compare_skips_zero_baseline():
+    baseline = {"serving.chat.errors": metric(0, "count", "lower")}
+    current = {"serving.chat.errors": metric(3, "count", "lower")}
+
+    assert run.compare(current, baseline, 0.1) == []
+
+
+def test_compare_respects_direction():
+    baseline = {"qps": metric(100.0, "queries/s", "higher"), "seconds": metric(1.0, "s", "lower")}
+
+    # Fewer queries per second and more seconds are both worse
+    worse = {"qps": metric(80.0, "queries/s", "higher"), "seconds": metric(1.3, "s", "lower")}
+    assert [(name, round(change, 2)) for name, _, _, change in run.compare(worse, baseline, 0.1)] == [
+        ("qps", 0.2),
+        ("seconds", 0.3),
+    ]
+
+    better = {"qps": metric(130.0, "queries/s", "higher"), "seconds": metric(0.7, "s", "lower")}
+    assert run.compare(better, baseline, 0.1) == []
+
+
+def test_compare_ignores_changes_within_spread():
+    baseline = {"seconds": metric(1.0, "s", "lower", spread=0.2)}
+
+    assert run.compare({"seconds": metric(1.25, "s", "lower", spread=0.1)}, baseline, 0.1) == []
+    assert run.compare({"seconds": metric(1.35, "s", "lower", spread=0.1)}, baseline, 0.1)
+
+
+def test_missing_metrics_only_for_suites_that_ran():
+    baseline = {
+        "index.hnsw.1000.search_qps": metric(1.0, "queries/s", "higher"),
+        "index.flat.1000.search_qps": metric(1.0, "queries/s", "higher"),
+        "serving.chat.p50_ms": metric(1.0, "ms", "lower"),
+    }
+    current = {"index.flat.1000.search_qps": metric(1.0, "queries/s", "higher")}
+
+    assert run.missing_metrics(current, baseline, ["index"]) == ["index.hnsw.1000.search_qps"]
+
+
+def test_settings_mismatch_exits_2(tmp_path, monkeypatch):
+    monkeypatch.setattr(run, "run_suites", lambda args: ({}, []))
+    baseline_path = tmp_path / "baseline.json"
+    output = str(tmp_path / "out.json")
+
+    assert run.main(["--suites", "index", "--output", output, "--baseline", str(baseline_path), "--save-baseline"]) == 0
+    assert run.main(["--suites", "index", "--output", output, "--baseline", str(baseline_path), "--dim", "256"]) == 2
+    assert run.main(["--suites", "index", "--output", output, "--baseline", str(baseline_path)]) == 0
+
+
+def test_missing_metric_fails_the_run(tmp_path, monkeypatch):
+    baseline_path = tmp_path / "baseline.json"
+    output = str(tmp_path / "out.json")
+    produced = {"index.flat.1000.search_qps": metric(1.0, "queries/s", "higher")}
+
+    monkeypatch.setattr(run, "run_suites", lambda args: (dict(produced), []))
+    run.main(["--suites", "index", "--output", output, "--baseline", str(baseline_path), "--save-baseline"])
+
+    produced.clear()
+    assert run.main(["--suites", "index", "--output", output, "--baseline", str(baseline_path)]) == 1
+    assert "index.flat.1000.search_qps" not in json.loads(open(output).read())["metrics"]
+
+
+def test_crashed_suite_fails_the_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(run, "run_suites", lambda args: ({}, ["index"]))
+
+    assert run.main(["--suites", "index", "--output", str(tmp_path / "out.json"), "--baseline", str(tmp_path / "none.json")]) == 1
+
+
+def test_recall_at_k():
+    expected = np.array([[1, 2, 3], [4, 5, 6]])
+    found = np.array([[3, 2, 9], [4, 5, 6]])
+
+    assert recall_at_k(found, expected, 3) == pytest.approx(5 / 6)
+    # Only the first k of each list count
+    assert recall_at_k(found, expected, 1) == pytest.approx(1 / 2)
+
+
+def test_nlist_is_capped_by_training_points():
+    # 4 * sqrt(1000) = 126 lists would leave under 39 points per centroid
+    assert _nlist(1000) == 1000 // MIN_POINTS_PER_CENTROID == 25
+    assert _nlist(10000) == 10000 // MIN_POINTS_PER_CENTROID == 256
+    # Large corpora use the usual 4 * sqrt(n)
+    assert _nlist(1_000_000) == 4000
+    assert _nlist(10) == 1
+
+
+def test_min_training_points():
+    assert min_training_points("flat") == 0
+    assert min_training_points("hnsw") == 0
+    assert min_training_points("ivf") == MIN_POINTS_PER_CENTROID
+    assert min_training_points("ivfpq") == PQ_CENTROIDS * MIN_POINTS_PER_CENTROID == 9984
+
+
+def test_percentiles():
+    cuts = percentiles([float(i) for i in range(1, 101)])
+
+    assert cuts["p50"] == pytest.approx(50.5)
+    assert cuts["p95"] == pytest.approx(95.05)
+    assert cuts["p99"] == pytest.approx(99.01)
+    assert percentiles([2.0]) == {"p50": 2.0, "p95": 2.0, "p99": 2.0}
+
+
+def test_measure_repeats_fast_calls_up_to_min_duration():
+    calls = []
+
+    samples = measure(lambda: calls.append(None), repeats=3, min_seconds=0.01, warmup=2)
+
+    assert len(samples) == 3
+    # Each sample needed many calls to last 10 ms
+    assert len(calls) > 2 + 3 * 10
+    assert summarize([1.0, 2.0, 3.0]) == (2.0, 1.0)
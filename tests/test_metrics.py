@@ -0,0 +1,101 @@
+import contextvars
+
+import pytest
+
+from app import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _lines(prefix):
+    return [line for line in metrics.render_prometheus().splitlines() if line.startswith(prefix)]
+
+
+def test_histogram_buckets_are_cumulative():
+    for seconds in (0.001, 0.02, 0.02, 3.0, 120.0):
+        metrics.observe_stage("generation", seconds)
+
+    buckets = dict(
+        line.split('le="')[1].split('"} ')
+        for line in _lines('rag_stage_duration_seconds_bucket{stage="generation"')
+    )
+    assert buckets["0.005"] == "1"
+    assert buckets["0.01"] == "1"
+    assert buckets["0.025"] == "3"
+    assert buckets["2.5"] == "3"
+    assert buckets["5.0"] == "4"
+    assert buckets["60.0"] == "4"
+    # Observations above the largest bound only land in +Inf
+    assert buckets["+Inf"] == "5"
+    assert _lines('rag_stage_duration_seconds_count{stage="generation"}') == [
+        'rag_stage_duration_seconds_count{stage="generation"} 5'
+    ]
+
+
+def test_exposition_declares_types():
+    text = metrics.render_prometheus()
+    assert "# TYPE rag_stage_duration_seconds histogram" in text
+    assert "# TYPE rag_tokens_total counter" in text
+    assert "# TYPE rag_queue_depth gauge" in text
+    assert text.endswith("\n")
+
+
+def test_tokens_skip_missing_counts():
+    metrics.record_tokens("input", 12)
+    metrics.record_tokens("input", None)
+    metrics.record_tokens("output", None)
+    metrics.record_tokens("input", 3)
+
+    assert _lines("rag_tokens_total") == ['rag_tokens_total{kind="input"} 15']
+
+
+def test_queue_depth():
+    metrics.inc_queue_depth()
+    metrics.inc_queue_depth()
+    metrics.dec_queue_depth()
+
+    assert _lines("rag_queue_depth ") == ["rag_queue_depth 1"]
+
+
+def test_format_server_timing_sums_repeated_stages():
+    timings = [("embed_query", 0.002), ("generation", 1.5), ("embed_query", 0.0015)]
+
+    assert metrics.format_server_timing(timings) == "embed_query;dur=3.5, generation;dur=1500.0"
+
+
+def test_request_timings_only_collect_inside_a_request():
+    metrics.observe_stage("outside", 0.1)
+
+    token = metrics.start_request_timings()
+    with metrics.timed("inside"):
+        pass
+    timings = metrics.finish_request_timings(token)
+
+    assert [stage for stage, _ in timings] == ["inside"]
+    # The stage is still recorded in the global histograms
+    assert _lines('rag_stage_duration_seconds_count{stage="inside"}')
+
+
+def test_request_timings_are_isolated_per_context():
+    def nested_request():
+        token = metrics.start_request_timings()
+        metrics.observe_stage("nested", 0.01)
+        return metrics.finish_request_timings(token)
+
+    def outer_request():
+        token = metrics.start_request_timings()
+        metrics.observe_stage("before", 0.01)
+        # A request served concurrently must not see or replace this one's timings
+        nested = contextvars.copy_context().run(nested_request)
+        metrics.observe_stage("after", 0.01)
+        return metrics.finish_request_timings(token), nested
+
+    outer, nested = contextvars.copy_context().run(outer_request)
+
+    assert [stage for stage, _ in outer] == ["before", "after"]
+    assert [stage for stage, _ in nested] == ["nested"]